@@ -84,6 +84,11 @@ CORE_TOKENS = (
 
 TOKENS_V2 = CORE_TOKENS  # Case for Commodore BASIC v2.0 TODO: Add versions
 
+# Keyword tokens for each supported Commodore BASIC version
+BASIC_TOKENS = {
+    '2': TOKENS_V2,
+}
+
 # Tokens for special character designations used by Ahoy
 SHFT_CMDRE_TKNS = (
     ('ep',          92),
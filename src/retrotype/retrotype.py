@@ -14,6 +14,53 @@ try:
 except ImportError:  # Case for direct python execution
     import char_maps
 
+# Ahoy special character codes, e.g. {CD} or repeated codes such as {4"{CD}"}
+# (a brace outside of any code is matched on its own and flagged as loose)
+_AHOY_CODE_RE = re.compile(r"{\d+\s?\".[^{]*?\"}|{.[^{]*?}|[{}]")
+_AHOY_REPEAT_RE = re.compile(r"{(\d+)\s?\"(.+?)\"}")
+
+# Candidate petcat or shifted/commodore special character code
+_SPECIAL_CODE_RE = re.compile(r"{[^{}]*}")
+
+# Latin lowercase letters shifted by -32 to their petscii values
+_PETSCII_UPPER = str.maketrans({c: c - 32 for c in range(97, 123)})
+
+# Leading line number with surrounding whitespace (digits may be missing)
+_LINE_NUM_RE = re.compile(r"\s*(\d*)\s*")
+
+
+def _build_trie(*token_maps):
+    """Build a prefix tree of nested dicts from (token, value) pairs, with the
+       value of each complete token stored under the '_end' key
+
+    Args:
+        token_maps (tuple): One or more tuples of (token, value) pairs
+
+    Returns:
+        dict: Nested dicts keyed by successive token characters
+    """
+
+    trie = {}
+    for token_map in token_maps:
+        for (token, value) in token_map:
+            node = trie
+            for char in token:
+                node = node.setdefault(char, {})
+            node.setdefault('_end', value)
+    return trie
+
+
+# keyword tries for each BASIC version, built once at import
+_TOKEN_TRIES = {version: _build_trie(tokens)
+                for (version, tokens) in char_maps.BASIC_TOKENS.items()}
+
+# Byte values that end tokenization: quote character and REM token
+_QUOTE = 34
+_REM = 143
+
+# petcat and shifted/commodore special characters keyed by their full code
+_SPECIAL_TOKENS = dict(char_maps.PETCAT_TOKENS + char_maps.SHIFT_CMDRE_TOKENS)
+
 
 def read_file(filename):
     """Opens and reads magazine source, strips whitespace, and
@@ -28,13 +75,8 @@ def read_file(filename):
     """
 
     with open(filename) as file:
-        lines = file.readlines()
-        lower_lines = []
-        for line in lines:
-            if not line.strip():
-                continue
-            lower_lines.append(line.rstrip().lower())
-        return lower_lines
+        lines = file.read().lower().splitlines()
+    return [line for line in map(str.rstrip, lines) if line]
 
 
 def write_binary(filename, int_list):
@@ -52,8 +94,7 @@ def write_binary(filename, int_list):
 
     try:
         with open(filename, "xb") as file:
-            for byte in int_list:
-                file.write(byte.to_bytes(1, byteorder='big'))
+            file.write(bytes(int_list))
             print(f'File "{filename}" written successfully.\n')
 
     except FileExistsError:
@@ -121,74 +162,50 @@ def ahoy_lines_list(lines_list):
         line = line.replace('[', '{')
         line = line.replace(']', '}')
 
-        # split each line on ahoy special characters
-        str_split = re.split(r"{\d+\s?\".[^{]*?\"}|{.[^{]*?}", line)
-
-        # check for loose braces in each substring, return error indication
-        for sub_str in str_split:
-            loose_brace = re.search(r"\}|{", sub_str)
-            # Improve loose brace error handling, inconsistent return
-            if loose_brace is not None:
-                return (None, line)
-
-        # create list of ahoy special character code strings
-        code_split = re.findall(r"{\d+\s?\".+?\"}|{.+?}", line)
-
-        new_codes = []
-
-        # for each ahoy special character, append the petcat equivalent
-        num = 0
-
-        for item in code_split:
+        # replace each ahoy special character with the petcat equivalent,
+        # return error indication if a loose brace is found
+        # Improve loose brace error handling, inconsistent return
+        try:
+            new_lines.append(_AHOY_CODE_RE.sub(_ahoy_to_petcat, line))
+        except ValueError:
+            return (None, line)
 
-            if item.upper() in char_maps.AHOY_TO_PETCAT:
-                new_codes.append(char_maps.AHOY_TO_PETCAT[item.upper()])
+    return new_lines
 
-            elif re.match(r"{\d+\s?\".+?\"}", item):
-                # Extract number of times to repeat special character
-                char_count = int(re.search(r"\d+\b", item).group())
-                # Get the string inside the brackets and strip quotes on ends
-                char_code = re.search(r"\".+?\"", item).group()[1:-1]
 
-                if char_code.upper() in char_maps.AHOY_TO_PETCAT:
-                    new_codes.append(char_maps.AHOY_TO_PETCAT
-                                     [char_code.upper()])
+def _ahoy_to_petcat(match):
+    """Convert a matched Ahoy special character code to its petcat equivalent
 
-                    while char_count > 1:
-                        new_codes.append(char_maps.AHOY_TO_PETCAT
-                                         [char_code.upper()])
-                        str_split.insert(num + 1, '')
-                        num += 1
-                        char_count -= 1
+    Args:
+        match (re.Match): Match of an Ahoy code, a repeated code such as
+            {4"{CD}"}, or a loose brace
 
-                else:
-                    new_codes.append(char_code)
-                    while char_count > 1:
-                        new_codes.append(char_code)
-                        str_split.insert(num + 1, '')
-                        num += 1
-                        char_count -= 1
+    Returns:
+        str: Petcat code (repeated if requested), or the original text for
+            codes without a petcat equivalent
 
-            else:
-                new_codes.append(item)
-            num += 1
+    Raises:
+        ValueError: If the match is a loose brace
+    """
 
-        # add blank item to list of special characters prior to blending strs
-        if new_codes:
-            new_codes.append('')
+    code = match.group()
 
-            new_line = []
+    if code in ('{', '}'):
+        raise ValueError(f"Loose brace: {code}")
 
-            # piece the string segments and petcat codes back together
-            for count in range(len(new_codes)):
-                new_line.extend((str_split[count], new_codes[count]))
+    if code.upper() in char_maps.AHOY_TO_PETCAT:
+        return char_maps.AHOY_TO_PETCAT[code.upper()]
 
-        # handle case where line contained no special characters
-        else:
-            new_line = str_split
-        new_lines.append(''.join(new_line))
+    repeat = _AHOY_REPEAT_RE.match(code)
+    if repeat is None:
+        return code
 
-    return new_lines
+    # Extract number of times to repeat special character and the string
+    # inside the quotes
+    char_count = max(int(repeat.group(1)), 1)
+    char_code = repeat.group(2)
+    return char_maps.AHOY_TO_PETCAT.get(char_code.upper(), char_code) \
+        * char_count
 
 
 def split_line_num(line):
@@ -204,79 +221,108 @@ def split_line_num(line):
                 stripped
     """
 
-    line = line.lstrip()
-    acc = []
-    while line and line[0].isdigit():
-        acc.append(line[0])
-        line = line[1:]
+    # int() raises ValueError when the line does not start with a number
+    match = _LINE_NUM_RE.match(line)
+    return (int(match.group(1)), line[match.end():])
 
-    return (int(''.join(acc)), line.lstrip())
 
+def scan_manager(ln, basic_version='2'):
+    """Scan each line for BASIC keywords, petcat special characters, or ascii
+       characters and convert them to tokenized bytes
 
-# manage the tokenization process for each line text string
-def scan_manager(ln):
-    in_quotes = False
-    in_remark = False
-    bytestr = []
+    Args:
+        ln (str): Text of each line to parse and convert
+        basic_version (str): Commodore BASIC version whose keywords are
+            tokenized (key of char_maps.BASIC_TOKENS)
+
+    Returns:
+        bytearray: Tokenized bytes for the line, terminated by a zero byte
+    """
+
+    token_trie = _TOKEN_TRIES[basic_version]
+    bytestr = bytearray()
+    i = 0
+    n = len(ln)
+
+    while i < n:
+        char = ln[i]
+        byte = None
+
+        # look up petcat and shifted/commodore special characters by the code
+        # up to the closing brace
+        if char == '{':
+            end = ln.find('}', i) + 1
+            if end:
+                byte = _SPECIAL_TOKENS.get(ln[i:end])
+                if byte is not None:
+                    i = end
+
+        # otherwise walk the trie from the current position, keeping the
+        # longest BASIC keyword matched
+        else:
+            node = token_trie.get(char)
+            end = i + 1
+            while node is not None:
+                if '_end' in node:
+                    byte = node['_end']
+                    match_end = end
+                if end == n:
+                    break
+                node = node.get(ln[end])
+                end += 1
+            if byte is not None:
+                i = match_end
+
+        if byte is None:
+            # for characters without token values, convert to unicode (ascii)
+            # value and, for latin letters, shift values by -32 to account for
+            # difference between ascii and petscii used by Commodore BASIC
+            byte = ord(char)
+            if byte >= 97 and byte <= 122:
+                byte -= 32
+            i += 1
 
-    while ln:
-        (byte, ln) = _scan(ln, tokenize=not (in_quotes or in_remark))
-        # if byte is not None:
         bytestr.append(byte)
-        if byte == ord('"'):
-            in_quotes = not in_quotes
-        if byte == 143:
-            in_remark = True
+
+        # text up to and including the closing quote, or the rest of the line
+        # after a REM statement, is not tokenized
+        if byte == _QUOTE:
+            end = ln.find('"', i) + 1 or n
+            bytestr += _untokenized_bytes(ln[i:end])
+            i = end
+        elif byte == _REM:
+            bytestr += _untokenized_bytes(ln[i:])
+            break
+
     bytestr.append(0)
     return bytestr
 
 
-# scan each line segement and convert to tokenized bytes.
-# returns byte and remaining line segment
-def _scan(ln, tokenize=True):
-    """Scan beginning of each line for BASIC keywords, petcat special
-       characters, or ascii characters, convert to tokenized bytes, and
-       return remaining line segment after converted characters are removed
+def _untokenized_bytes(text):
+    """Convert text inside quotes or after a REM statement, where BASIC
+       keywords are not tokenized, to bytes
 
     Args:
-        ln (str): Text of each line segment to parse and convert
-        tokenize (bool): Flag to indicate if start of line segment should be
-            tokenized (False if line segment start is within quotes or after
-            a REM statement)
+        text (str): Text to convert
 
     Returns:
-        tuple consisting of:
-            character/token value (int): Decimal value of ascii character or
-                tokenized word
-            remainder of line (str): Text for remainder of line with keyword,
-                specical character, or alphanumeric character stripped
+        bytearray: Petcat and shifted/commodore special character values,
+            with all other characters converted as in scan_manager()
     """
 
-    # check if each line passed in starts with a petcat special character
-    # if so, return value of token and line with token string removed
-    for (token, value) in char_maps.PETCAT_TOKENS:
-        if ln.startswith(token):
-            return (value, ln[len(token):])
-    # check if each line passed in starts with shifted or commodore special
-    # character.  if so, return value of token, line with token string removed
-    for (token, value) in char_maps.SHIFT_CMDRE_TOKENS:
-        if ln.startswith(token):
-            return (value, ln[len(token):])
-    # if tokenize flag is True (i.e. line beginning is not inside quotes or
-    # after a REM statement), check if line starts with a BASIC keyword
-    # if so, return value of token and line with BASIC keyword removed
-    if tokenize:
-        for (token, value) in char_maps.TOKENS_V2:
-            if ln.startswith(token):
-                return (value, ln[len(token):])
-    # for characters without token values, convert to unicode (ascii) value
-    # and, for latin letters, shift values by -32 to account for difference
-    # between ascii and petscii used by Commodore BASIC
-    # finally, return character value and line with character removed
-    char_val = ord(ln[0])
-    if char_val >= 97 and char_val <= 122:
-        char_val -= 32
-    return (char_val, ln[1:])
+    bytestr = bytearray()
+    start = 0
+
+    # copy the literal text between special character codes in one go
+    for code in _SPECIAL_CODE_RE.finditer(text):
+        value = _SPECIAL_TOKENS.get(code.group())
+        if value is not None:
+            bytestr += text[start:code.start()].translate(_PETSCII_UPPER) \
+                .encode('latin-1')
+            bytestr.append(value)
+            start = code.end()
+    bytestr += text[start:].translate(_PETSCII_UPPER).encode('latin-1')
+    return bytestr
 
 
 def ahoy1_checksum(byte_list):
@@ -369,10 +415,7 @@ def ahoy3_checksum(line_num, byte_list):
     line_low = line_num % 256
     line_hi = int(line_num / 256)
 
-    byte_list = [line_low] + [line_hi] + byte_list
-
-    # byte_list.insert(0, line_hi)
-    # byte_list.insert(0, line_low)
+    byte_list = [line_low, line_hi, *byte_list]
 
     for char_val in byte_list:
 
@@ -397,11 +440,9 @@ def ahoy3_checksum(line_num, byte_list):
     # get high nibble of xor_value
     high_nib = (xor_value & 0xf0) >> 4
     high_char_val = high_nib + 65  # 0x41
-    # high_char_val = high_char_val & 0x0f
     # get low nibble of xor_value
     low_nib = xor_value & 0x0f
     low_char_val = low_nib + 65  # 0x41
-    # low_char_val = low_char_val & 0x0f
     checksum = chr(high_char_val) + chr(low_char_val)
     return checksum
 
@@ -418,5 +459,4 @@ def write_checksums(filename, ahoy_checksums):
     output.append(f'\nLines: {len(ahoy_checksums)}\n')
 
     with open(filename, 'w') as f:
-        for line in output:
-            f.write(line)
+        f.writelines(output)
@@ -6,7 +6,7 @@ emulator or on original hardware.
 
 import argparse
 from argparse import RawTextHelpFormatter
-from os import get_terminal_size
+from os import get_terminal_size, path
 import sys
 import math
 
@@ -98,6 +98,7 @@ def print_checksums(ahoy_checksums, terminal_width):
     # Determine number of rows based on column count
     rows = math.ceil(len(ahoy_checksums) / columns)
 
+    output = []
     # Print each line number, code combination in matrix format
     for i in range(rows):
         for j in range(columns):
@@ -106,10 +107,11 @@ def print_checksums(ahoy_checksums, terminal_width):
                 prt_line = str(ahoy_checksums[indx][0])
                 prt_code = str(ahoy_checksums[indx][1])
                 left_space = 7 - len(prt_line) - len(prt_code)
-                print(" "*left_space, prt_line, prt_code, " "*2, end='')
-        print(end='\n')
+                output.append(f'{" "*left_space} {prt_line} {prt_code}   ')
+        output.append('\n')
 
-    print(f'\nLines: {len(ahoy_checksums)}\n')
+    output.append(f'\nLines: {len(ahoy_checksums)}\n')
+    print(''.join(output))
 
 
 def command_line_runner(argv=None, width=None):
@@ -142,25 +144,21 @@ def command_line_runner(argv=None, width=None):
 
     addr = int(args.loadaddr[0], 16)
 
-    out_list = []
+    # start output with the load address, ahead of the first line
+    out_list = bytearray(addr.to_bytes(2, 'little'))
     ahoy_checksums = []
 
     for line in lines_list:
         # split each line into line number and remaining text
         (line_num, line_txt) = split_line_num(line)
 
-        token_ln = []
-        # add load address at start of first line only
-        if addr == int(args.loadaddr[0], 16):
-            token_ln.append(addr.to_bytes(2, 'little'))
         byte_list = scan_manager(line_txt)
 
         addr = addr + len(byte_list) + 4
 
-        token_ln.extend((addr.to_bytes(2, 'little'),
-                         line_num.to_bytes(2, 'little'), byte_list))
-
-        token_ln = [byte for sublist in token_ln for byte in sublist]
+        out_list += addr.to_bytes(2, 'little')
+        out_list += line_num.to_bytes(2, 'little')
+        out_list += byte_list
 
         # call checksum generator function to build list of tuples
         if args.source[0] == 'ahoy1':
@@ -176,17 +174,13 @@ def command_line_runner(argv=None, width=None):
             print("Magazine format not yet supported.")
             sys.exit(1)
 
-        out_list.append(token_ln)
-
-    out_list.append([0, 0])
-
-    dec_list = [byte for sublist in out_list for byte in sublist]
+    out_list += b'\x00\x00'
 
-    file_stem = args.file_in.split('.')[0]
+    file_stem = path.splitext(args.file_in)[0]
     bin_file = f'{file_stem}.prg'
 
     # Write binary file compatible with Commodore computers or emulators
-    write_binary(bin_file, dec_list)
+    write_binary(bin_file, out_list)
 
     # Print line checksums to terminal, formatted based on screen width
     print('Line Checksums:\n')
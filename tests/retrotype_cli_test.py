@@ -94,6 +94,22 @@ def test_command_line_runner(tmp_path, capsys, source, lines_list, term):
     assert captured.out == term_capture
 
 
+def test_command_line_runner_dotted_path(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() names the
+    output files after the input file when its directory contains a dot.
+    """
+    d = tmp_path / "sub.v2"
+    d.mkdir()
+    p = d / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10')
+
+    command_line_runner([str(p)], 40)
+
+    assert (d / "example.prg").is_file()
+    assert (d / "example.chk").is_file()
+
+
 @pytest.mark.parametrize(
     "user_entry, source, lines_list, term",
     [
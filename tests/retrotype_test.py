@@ -5,7 +5,6 @@ from retrotype.retrotype import (read_file,
                                  check_line_number_seq,
                                  ahoy_lines_list,
                                  split_line_num,
-                                 _scan,
                                  scan_manager,
                                  write_binary,
                                  ahoy1_checksum,
@@ -162,6 +161,7 @@ def test_ahoy_lines_list(lines_list, new_lines):
         ('10 print"hello!"', (10, 'print"hello!"')),
         ('20   goto10', (20, 'goto10')),
         ('30{wh}val = 3.2*num', (30, '{wh}val = 3.2*num')),
+        ('  40 rem 50', (40, 'rem 50')),
     ],
 )
 def test_split_line_num(line, split_line):
@@ -219,43 +219,44 @@ def test_confirm_overwrite(capsys, monkeypatch, user_entry, return_value):
 @pytest.mark.parametrize(
     "ln, bytestr",
     [
-        ('rem lawn', [143, 32, 76, 65, 87, 78, 0]),
-        ('goto110', [137, 49, 49, 48, 0]),
-        ('printtab(10);sc$', [153, 163, 49, 48, 41, 59, 83, 67, 36, 0]),
+        ('rem lawn', b'\x8f LAWN\x00'),
+        ('goto110', b'\x89110\x00'),
+        ('printtab(10);sc$', b'\x99\xa310);SC$\x00'),
         ('printtab(16)"{lgrn}{down}l',
-         [153, 163, 49, 54, 41, 34, 153, 17, 76, 0]),
+         b'\x99\xa316)"\x99\x11L\x00'),
         ('data15,103,255,169',
-         [131, 49, 53, 44, 49, 48, 51, 44, 50, 53, 53, 44, 49, 54, 57, 0]),
+         b'\x8315,103,255,169\x00'),
+        ('rem start mower', b'\x8f START MOWER\x00'),
+        ('{wht}"tab(32)', b'\x05"TAB(32)\x00'),
+        ('{c g} test commodore-g', b'\xa5 TEST COMMOD\xb0E\xabG\x00'),
+        ('{s ep}rem', b'\xa9\x8f\x00'),
+        ('input#1,a$', b'\x841,A$\x00'),
+        ('inputa$', b'\x85A$\x00'),
+        ('print#4', b'\x984\x00'),
+        ('gosub100', b'\x8d100\x00'),
+        ('go to100', b'\xcb \xa4100\x00'),
+        ('"{c ep}{c e}"', b'"\xa8\xb1"\x00'),
+        ('"goto"goto', b'"GOTO"\x89\x00'),
+        ('?"{zz}{rvon"{', b'?"{ZZ}{RVON"{\x00'),
+        ('rem "goto" {wht}{x{c e}', b'\x8f "GOTO" \x05{X\xb1\x00'),
     ],
 )
 def test_scan_manager(ln, bytestr):
     """
     Unit test to check that function scan_manager() is properly managing the
-    conversion of a line of text to a list of tokenized bytes in decimal form.
+    conversion of a line of text to a bytearray of tokenized bytes.
     """
     assert scan_manager(ln) == bytestr
 
 
-@pytest.mark.parametrize(
-    "ln, tokenize, byte, remaining_line",
-    [
-        (' space test', False, 32, 'space test'),
-        ('goto11', True, 137, '11'),
-        ('goto11', False, 71, 'oto11'),
-        ('rem start mower', True, 143, ' start mower'),
-        (' start mower', False, 32, 'start mower'),
-        ('{wht}"tab(32)', True, 5, '"tab(32)'),
-        ('{c g} test commodore-g', True, 165, ' test commodore-g'),
-        ('{s ep}start mower', True, 169, 'start mower'),
-    ],
-)
-def test__scan(ln, tokenize, byte, remaining_line):
+def test_scan_manager_basic_version():
     """
-    Unit test to check that function _scan() is properly converting the start
-    of each passed in line to a tokenized byte for BASIC keywords, petcat
-    special characters, and alphanumeric characters.
+    Unit test to check that function scan_manager() tokenizes keywords for the
+    requested BASIC version and rejects unknown versions.
     """
-    assert _scan(ln, tokenize) == (byte, remaining_line)
+    assert scan_manager('goto110', '2') == b'\x89110\x00'
+    with pytest.raises(KeyError):
+        scan_manager('goto110', '7')
 
 
 @pytest.mark.parametrize(